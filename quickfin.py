@@ -14,16 +14,426 @@ __version__ = "1.14.1"
 __author__ = "Derek Evans <https://github.com/REPNOT>"
 __date__ = "28 March 2024"
 
+import argparse
+import hashlib
 import json
+import math
+import operator
+import sys
+import threading
+from array import array
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from pprint import pprint
 import requests
 import datetime
-from datetime import datetime
-from urllib.request import Request, urlopen
+import time
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
 import plotly.graph_objects as go
 from pathlib import Path
 import os
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class DataSource():
+
+    """
+    The source of all raw data used by the `FinInfo` and
+    `PriceData` classes, retrieving responses over the
+    network.
+
+    Pass an instance of a subclass to the `source`
+    parameter of either class to change where data comes
+    from, e.g. `RecordingSource` and `ReplaySource`.
+    """
+
+    def fetch(self, url):
+
+        """
+        Return the raw response body for `url` as bytes.
+        """
+
+        response = requests.get(url)
+        response.raise_for_status()
+
+        return response.content
+
+    def lines(self, url):
+
+        """
+        Return the raw response body for `url` as an array
+        of lines, line endings included.
+        """
+
+        return self.fetch(url).splitlines(keepends=True)
+
+
+class RecordingSource(DataSource):
+
+    """
+    A data source that retrieves responses from the wrapped
+    `source` (the network by default) and saves a copy of
+    each one to the `archive` directory for later replay
+    with `ReplaySource`.
+    """
+
+    def __init__(self, archive, source=None):
+
+        self.archive = Path(archive)
+        self.archive.mkdir(parents=True, exist_ok=True)
+        self.source = source or DataSource()
+        self.lock = threading.Lock()
+
+    def fetch(self, url):
+
+        content = self.source.fetch(url)
+        key = _archive_key(url)
+        temporary = self.archive / f".{key}.{threading.get_ident()}.tmp"
+        temporary.write_bytes(content)
+        os.replace(temporary, self.archive / key)
+
+        with self.lock, open(self.archive / "index.jsonl", "a") as index:
+            index.write(json.dumps({"key": key, "url": url}) + "\n")
+
+        return content
+
+
+class ReplaySource(DataSource):
+
+    """
+    A data source that serves responses saved by
+    `RecordingSource` from the `archive` directory without
+    any network access.
+
+    Requests are matched on their URL ignoring the
+    `period1` and `period2` query parameters, so a
+    recording keeps replaying as the current date moves
+    on.  A request that was never recorded raises
+    `KeyError`.
+    """
+
+    def __init__(self, archive):
+
+        self.archive = Path(archive)
+
+    def _path(self, url):
+
+        path = self.archive / _archive_key(url)
+
+        if not path.exists():
+            raise KeyError(f"no recorded response for {url}")
+
+        return path
+
+    def fetch(self, url):
+
+        return self._path(url).read_bytes()
+
+
+def _archive_key(url):
+
+    """
+    Return the archive file name for `url`, ignoring the
+    time dependent `period1` and `period2` parameters.
+    """
+
+    parts = urlsplit(url)
+    query = sorted((key, value) for key, value in parse_qsl(parts.query) if key not in ("period1", "period2"))
+    normalized = f"{parts.netloc}{parts.path}?{urlencode(query)}"
+
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+class MarketCalendar():
+
+    """
+    A local trading calendar for the regular sessions of
+    the US stock exchanges (NYSE and Nasdaq), 9:30 to 16:00
+    US Eastern time with 13:00 early closes.
+
+    Holidays and early closes are derived from the exchange
+    rules rather than a published list: New Year's Day,
+    Martin Luther King Jr. Day, Washington's Birthday, Good
+    Friday, Memorial Day, Juneteenth (from 2022),
+    Independence Day, Labor Day, Thanksgiving and Christmas,
+    observed on the Friday before or the Monday after when
+    they fall on a weekend.  Special closures such as
+    national days of mourning are not included.
+
+    Times are epoch seconds, as returned by `time.time()`.
+    """
+
+    open_time = (9, 30)
+    close_time = (16, 0)
+    early_close_time = (13, 0)
+
+    def __init__(self):
+
+        self.years = {}
+
+    def holidays(self, year):
+
+        """
+        Return the set of exchange holidays in `year`.
+        """
+
+        return self._year(year)[0]
+
+    def early_closes(self, year):
+
+        """
+        Return the set of early close days in `year`.
+        """
+
+        return self._year(year)[1]
+
+    def _year(self, year):
+
+        if year in self.years:
+            return self.years[year]
+
+        holidays = {
+            _nth_weekday(year, 1, 0, 3),
+            _nth_weekday(year, 2, 0, 3),
+            _easter(year) - timedelta(days=2),
+            _nth_weekday(year, 5, 0, -1),
+            _nth_weekday(year, 9, 0, 1),
+            _nth_weekday(year, 11, 3, 4)
+        }
+
+        fixed = [(1, 1), (7, 4), (12, 25)] + ([(6, 19)] if year >= 2022 else [])
+
+        for month, day in fixed:
+            holiday = datetime(year, month, day)
+            if holiday.weekday() == 5 and (month, day) != (1, 1):
+                holidays.add(holiday - timedelta(days=1))
+            elif holiday.weekday() == 6:
+                holidays.add(holiday + timedelta(days=1))
+            elif holiday.weekday() < 5:
+                holidays.add(holiday)
+
+        early_closes = {
+            _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+            datetime(year, 12, 24),
+            datetime(year, 7, 3)
+        }
+        early_closes = {day for day in early_closes if day.weekday() < 5 and day not in holidays}
+
+        self.years[year] = (holidays, early_closes)
+
+        return self.years[year]
+
+    def is_trading_day(self, day):
+
+        """
+        Return `True` if the exchanges hold a session on
+        `day`, a `date` or `datetime`.
+        """
+
+        day = datetime(day.year, day.month, day.day)
+
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def session(self, day):
+
+        """
+        Return the open and close times of the session on
+        `day` as epoch seconds, or `None` if the exchanges
+        are closed all day.
+        """
+
+        day = datetime(day.year, day.month, day.day)
+
+        if not self.is_trading_day(day):
+            return None
+
+        close = self.early_close_time if day in self.early_closes(day.year) else self.close_time
+
+        return (
+            _eastern_to_epoch(day.replace(hour=self.open_time[0], minute=self.open_time[1])),
+            _eastern_to_epoch(day.replace(hour=close[0], minute=close[1]))
+        )
+
+    def is_open(self, now=None):
+
+        """
+        Return `True` if a regular session is in progress.
+        """
+
+        now = time.time() if now is None else now
+        session = self.session(_epoch_to_eastern(now))
+
+        return session is not None and session[0] <= now < session[1]
+
+    def next_open(self, now=None):
+
+        """
+        Return the opening time of the next session starting
+        after `now`, as epoch seconds.
+        """
+
+        now = time.time() if now is None else now
+        day = _epoch_to_eastern(now)
+
+        while True:
+            session = self.session(day)
+            if session is not None and session[0] > now:
+                return session[0]
+            day += timedelta(days=1)
+
+
+class QuoteCache():
+
+    """
+    A time-to-live cache for price data responses whose
+    expiry follows the `MarketCalendar`.
+
+    While a session is in progress, and for `settle` seconds
+    after the close while final prices are published,
+    entries expire after `ttl` seconds.  Outside of those
+    hours entries are kept until the next session opens,
+    so weekends, holidays and nights are served entirely
+    from the cache.
+
+    At most `maxsize` entries are kept; expired entries are
+    dropped whenever a value is stored, then the least
+    recently used ones once the cache is full.
+
+    Pass an instance to the `cache` parameter of the
+    `PriceData` class.
+    """
+
+    def __init__(self, ttl=60, settle=900, calendar=None, maxsize=256):
+
+        self.ttl = ttl
+        self.settle = settle
+        self.maxsize = maxsize
+        self.calendar = calendar or MarketCalendar()
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def expiry(self, now=None):
+
+        """
+        Return the time at which an entry stored at `now`
+        expires, as epoch seconds.
+        """
+
+        now = time.time() if now is None else now
+        session = self.calendar.session(_epoch_to_eastern(now))
+
+        if session is not None and session[0] <= now < session[1] + self.settle:
+            return now + self.ttl
+
+        return self.calendar.next_open(now)
+
+    def get(self, key, fetch):
+
+        """
+        Return the cached value for `key`, calling `fetch`
+        to retrieve and store it when missing or expired.
+        """
+
+        now = time.time()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                self.entries[key] = self.entries.pop(key)
+                return entry[1]
+            self.misses += 1
+
+        value = fetch()
+
+        with self.lock:
+            self.entries.pop(key, None)
+            for expired in [name for name, (expires, _) in self.entries.items() if expires <= now]:
+                del self.entries[expired]
+            while self.maxsize and len(self.entries) >= self.maxsize:
+                del self.entries[next(iter(self.entries))]
+            self.entries[key] = (self.expiry(now), value)
+
+        return value
+
+    def clear(self):
+
+        """
+        Remove every cached entry.
+        """
+
+        with self.lock:
+            self.entries.clear()
+
+
+def _nth_weekday(year, month, weekday, n):
+
+    """
+    Return the `n`th `weekday` (Monday is 0) of a month,
+    or the last one when `n` is -1.
+    """
+
+    if n > 0:
+        first = datetime(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    last = datetime(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+
+    """
+    Return Easter Sunday of `year` (Gregorian calendar).
+    """
+
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+
+    return datetime(year, month, day + 1)
+
+
+def _eastern_dst(local):
+
+    """
+    Return `True` if daylight saving time is in effect at
+    the US Eastern local time `local` (rules from 2007).
+    """
+
+    start = _nth_weekday(local.year, 3, 6, 2).replace(hour=2)
+    end = _nth_weekday(local.year, 11, 6, 1).replace(hour=2)
+
+    return start <= local < end
+
+
+def _eastern_to_epoch(local):
+
+    offset = 4 if _eastern_dst(local) else 5
+
+    return (local - datetime(1970, 1, 1)).total_seconds() + offset * 3600
+
+
+def _epoch_to_eastern(epoch):
+
+    local = datetime(1970, 1, 1) + timedelta(seconds=epoch - 5 * 3600)
+
+    return local + timedelta(hours=1) if _eastern_dst(local) else local
+
 
 class FinInfo():
 
@@ -42,14 +452,17 @@ class FinInfo():
     """
 
 
-    def __init__(self):
+    def __init__(self, source=None):
 
         """
-        Initialize the FinInfo class and retreive metadata catalog.
+        Initialize the FinInfo class and retreive metadata catalog
+        from the `DataSource` passed to the `source` parameter,
+        the network by default.
         """
 
         self.url = "https://gist.githubusercontent.com/REPNOT/6bffda0dd727d63a0bd727d4ff1c890a/raw/5228da45d64741489973b8e05a0abf3d2a3957c1/fin_data.json"
-        self.data = requests.get(self.url).json()
+        self.source = source or DataSource()
+        self.data = json.loads(self.source.fetch(self.url))
 
 
     def equity(self, symbol, payload=True):
@@ -334,279 +747,1075 @@ class FinInfo():
             return '===  ERROR: INVALID SECTOR ENTRY  ==='
 
 
-class PriceData():
+class Bar():
 
     """
-    A class providing instant access to live 
-    and historical stock market price data and
-    automated Plotly data visualization generators.
+    A compact, read-only record for a single daily
+    or intraday price bar.
+
+    Missing values are represented by `None` rather
+    than the empty string used by the object payloads.
+    The derived `change_amount`, `change_rate` and
+    `day_range` values are computed on access instead
+    of being stored.
     """
 
-    def __init__(self):
-        """
-        Initialize the PriceData class and assign values to global
-        variables.
-        """
-        start_target = datetime.strptime("1-21-1972", "%m-%d-%Y")
-        cur_date = datetime.strptime(datetime.now().strftime("%m-%d-%Y"), "%m-%d-%Y")
-        days = (cur_date - start_target).days
-        epoch_start = 76204800
-        epoch_target = (days * 86400) + 86400 + 1710979200
-        self.base_url = "https://query1.finance.yahoo.com/v7/finance/download/"
-        self.tail_url = f"?period1={str(epoch_start)}&period2={str(epoch_target)}&interval=1d&events=history&includeAdjustedClose=true"
+    __slots__ = ("date", "open", "high", "low", "close", "adj_close", "volume")
 
-    def current(self, symbol):
+    def __init__(self, date, open, high, low, close, adj_close, volume):
 
-        """
-        Return the most recent stock price data available
-        for the stock symbol passed to the `symbol`
-        parameter.  Method will return live market
-        price quotes during trading hours.
+        self.date = date
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.adj_close = adj_close
+        self.volume = volume
 
-        PAYLOAD CONTENTS:
+    def __repr__(self):
 
-        Object
-        """
+        return f"Bar({self.date}, open={self.open}, high={self.high}, low={self.low}, close={self.close}, volume={self.volume})"
 
-        self.symbol = symbol
-        info = FinInfo()
-        self.info = info.equity(symbol)
+    @property
+    def change_amount(self):
 
-        try:
-            url = self.base_url + self.symbol + self.tail_url
-            self.rawData = urlopen(Request(url)).readlines()
-        except:
-            return '===  ERROR: GET REQUEST FAILED  ==='
+        if self.open is None or self.close is None:
+            return None
 
-        try:
-            self.current_price = self.rawData[-1].decode().split(",")
-        except:
-            return '===  ERROR: DATA ERROR  ==='
+        return round(self.close - self.open, 2)
 
-        self.data = {"info":self.info}
-        self.data["current"] = {}
+    @property
+    def change_rate(self):
 
-        try:
-            self.data["current"]['Date'] = str(self.current_price[0])
-        except:
-            self.data["current"]['Date'] = ''
+        change_amount = self.change_amount
 
-        try:
-            self.data["current"]['Open'] = round(float(self.current_price[1]), 2)
-        except:
-            self.data["current"]['Open'] = ''
+        if change_amount is None:
+            return None
+        elif change_amount == 0:
+            return 0
+        elif not self.open:
+            return None
 
-        try:
-           self.data["current"]['High'] = round(float(self.current_price[2]), 2)
-        except:
-            self.data["current"]['High'] = ''
+        return round(change_amount / self.open, 4)
 
-        try:
-            self.data["current"]['Low'] = round(float(self.current_price[3]), 2)
-        except:
-            self.data["current"]['Low'] = ''
+    @property
+    def day_range(self):
 
-        try:
-           self.data["current"]['Close'] = round(float(self.current_price[4]), 2)
-        except:
-            self.data["current"]['Close'] = ''
+        if self.low is None or self.high is None:
+            return None
 
-        try:
-            self.data["current"]['Adj Close'] = round(float(self.current_price[5]), 2)
-        except:
-            self.data["current"]['Adj Close'] = ''
+        return abs(round(self.low - self.high, 2))
 
-        try:
-            self.data["current"]['Volume'] = int(self.current_price[6])
-        except:
-            self.data["current"]['Volume'] = ''
+    def to_dict(self):
 
-        try:
-            self.data["current"]['Change Amount'] = round((self.data["current"]['Close'] - self.data["current"]['Open']), 2)
-        except:
-            self.data["current"]['Change Amount'] = ''
+        """
+        Return the bar as an object using the same keys
+        and empty string missing values as the `history`
+        method payload.
+        """
 
-        try:
-            if self.data["current"]['Change Amount'] != 0:
-                self.data["current"]['Change Rate'] = round((self.data["current"]['Change Amount'] / self.data["current"]['Open']), 4)
-            else:
-                self.data["current"]['Change Rate'] = 0
-        except:
-            self.data["current"]['Change Rate'] = ''
+        values = {
+            "Date": self.date,
+            "Open": self.open,
+            "High": self.high,
+            "Low": self.low,
+            "Close": self.close,
+            "Adj Close": self.adj_close,
+            "Volume": self.volume,
+            "Change Amount": self.change_amount,
+            "Change Rate": self.change_rate,
+            "Day Range": self.day_range
+        }
 
-        try:
-            self.data["current"]['Day Range'] = round((self.data["current"]['Low'] - self.data["current"]['High']), 2)
-        except:
+        return {key: ('' if value is None else value) for key, value in values.items()}
 
-            self.data["current"]['Day Range'] = ''
 
-        try:
-            return self.data
-        except:
-            return '===  SYMBOL DATA TYPE ERROR OR SYMBOL UNAVAILABLE  ==='
+class BarHistory():
 
-    def history(self, symbol, days=None, date=None, date_start=None, date_end=None):
+    """
+    A column oriented container holding a whole price
+    history in `array` buffers.
+
+    Daily dates are stored as proleptic Gregorian ordinals,
+    intraday dates as UTC epoch seconds displayed with the
+    exchange `offset`, and prices and volume as doubles,
+    using 0 and NaN respectively as missing values.  A bar
+    costs 56 bytes of buffer space compared with well over
+    half a kilobyte for an object row.
+
+    Rows are ordered exactly as supplied; the `history`
+    method stores the most recent date first.  Indexing
+    returns a `Bar`, slicing returns a new `BarHistory`.
+    """
 
-        """
-        Return all historical stock price data available 
-        for the stock symbol passed to the `symbol` parameter.
-        
-        Passing a positive integer value to the `days` 
-        parameter will filter the historical data to include
-        records for the number of most recent days 
-        represented by the parameter value.
+    __slots__ = ("dates", "open", "high", "low", "close", "adj_close", "volume", "interval", "offset")
 
-        Passing a date to the `date` parameter
-        using the 'YYYY-DD-MM' format
-        will filter the historical data to include
-        a single record for the value 
-        assigned to the parameter.
+    columns = ("dates", "open", "high", "low", "close", "adj_close", "volume")
 
-        Passing a date to both the `date_start` 
-        and the `date_end` parameter
-        using the 'YYYY-DD-MM' format
-        will filter the historical data to include
-        multiple records for the date range
-        represented by both values.  Values must 
-        be passed to both the date_start and 
-        date_end parameter for date ranges to be returned.
+    def __init__(self, interval="1d", offset=0):
 
-        PAYLOAD CONTENTS:
+        self.interval = interval
+        self.offset = offset
+        self.dates = array("q")
+        self.open = array("d")
+        self.high = array("d")
+        self.low = array("d")
+        self.close = array("d")
+        self.adj_close = array("d")
+        self.volume = array("d")
 
-        Object containing equity metadata,
-        current price data, and an array
-        of objects consisting of daily price
-        data for all available dates.
+    def __len__(self):
 
-        """
+        return len(self.dates)
 
-        self.symbol = symbol
+    def __iter__(self):
 
-        try:
-            url = self.base_url + self.symbol + self.tail_url
-            self.rawData = urlopen(Request(url)).readlines()
-        except:
-            return '===  ERROR: GET REQUEST FAILED  ==='
+        for index in range(len(self.dates)):
+            yield self[index]
 
-        self.data = self.current(self.symbol)
-        self.data["history"] = []
+    def __getitem__(self, index):
 
-        try:
-            self.raw_data = self.rawData[1:][::-1]
-        except:
-            return '===  ERROR: DATA ERROR  ==='
+        if isinstance(index, slice):
+            bars = BarHistory(self.interval, self.offset)
+            for name in self.columns:
+                setattr(bars, name, getattr(self, name)[index])
+            return bars
 
-        for row in self.raw_data:
+        return Bar(
+            self._date(index),
+            _from_missing(self.open[index]),
+            _from_missing(self.high[index]),
+            _from_missing(self.low[index]),
+            _from_missing(self.close[index]),
+            _from_missing(self.adj_close[index]),
+            _from_missing(self.volume[index], int)
+        )
+
+    def __repr__(self):
+
+        return f"BarHistory({len(self)} {self.interval} bars)"
+
+    def _date(self, index):
+
+        value = self.dates[index]
+
+        if not value:
+            return None
+        elif self.interval == "1d":
+            return datetime.fromordinal(value).strftime("%Y-%m-%d")
+
+        return (datetime(1970, 1, 1) + timedelta(seconds=value + self.offset)).strftime("%Y-%m-%d %H:%M")
+
+    def _day(self, index):
+
+        value = self.dates[index]
+
+        if self.interval == "1d" or not value:
+            return value
+
+        return (datetime(1970, 1, 1) + timedelta(seconds=value + self.offset)).toordinal()
+
+    @classmethod
+    def from_csv(cls, lines):
+
+        """
+        Build a history from raw CSV lines (bytes or str)
+        in the `Date,Open,High,Low,Close,Adj Close,Volume`
+        layout.  Fields that cannot be parsed are stored
+        as missing values.
+        """
+
+        bars = cls()
+
+        for line in lines:
+
+            if isinstance(line, bytes):
+                line = line.decode()
+
+            fields = line.strip().split(",")
+            fields += [''] * (7 - len(fields))
+
+            try:
+                ordinal = datetime.fromisoformat(fields[0]).toordinal()
+            except ValueError:
+                ordinal = 0
+
+            bars.append(ordinal, *[_to_float(field, 2) for field in fields[1:6]], _to_float(fields[6]))
+
+        return bars
+
+    def append(self, date, open, high, low, close, adj_close, volume):
+
+        """
+        Append a single bar.  `date` may be a 'YYYY-MM-DD'
+        string or an ordinal for daily bars, or epoch
+        seconds for intraday bars.  Any value passed as
+        `None` is stored as missing.
+        """
+
+        if isinstance(date, str):
+            date = datetime.strptime(date, "%Y-%m-%d").toordinal()
+
+        self.dates.append(date or 0)
+        self.open.append(_to_missing(open))
+        self.high.append(_to_missing(high))
+        self.low.append(_to_missing(low))
+        self.close.append(_to_missing(close))
+        self.adj_close.append(_to_missing(adj_close))
+        self.volume.append(_to_missing(volume))
+
+    def take(self, indices):
+
+        """
+        Return a new `BarHistory` holding the rows at
+        the positions in `indices`.
+        """
+
+        bars = BarHistory(self.interval, self.offset)
+
+        for name in self.columns:
+            column = getattr(self, name)
+            setattr(bars, name, array(column.typecode, [column[index] for index in indices]))
+
+        return bars
+
+    def between(self, date_start, date_end):
+
+        """
+        Return the rows dated between `date_start` and
+        `date_end` inclusive, both as 'YYYY-MM-DD' strings.
+        """
+
+        start = datetime.strptime(date_start, "%Y-%m-%d").toordinal()
+        end = datetime.strptime(date_end, "%Y-%m-%d").toordinal()
+
+        return self.take([index for index in range(len(self.dates)) if start <= self._day(index) <= end])
+
+    def to_dicts(self):
+
+        """
+        Return the history as an array of objects
+        matching the `history` method payload.
+        """
+
+        return [bar.to_dict() for bar in self]
+
+
+class BarRing():
+
+    """
+    A fixed capacity ring buffer of price bars for a
+    single symbol and interval.
+
+    Appending to a full buffer overwrites the oldest bar,
+    so memory stays constant while a long running process
+    keeps adding bars.  Appending a bar with the same date
+    as the most recent one replaces it, which keeps the
+    bar currently in progress up to date.
+    """
+
+    __slots__ = ("capacity", "interval", "offset", "start", "size") + BarHistory.columns
+
+    def __init__(self, capacity, interval="1d", offset=0):
+
+        self.capacity = capacity
+        self.interval = interval
+        self.offset = offset
+        self.start = 0
+        self.size = 0
+        self.dates = array("q", [0]) * capacity
+
+        for name in BarHistory.columns[1:]:
+            setattr(self, name, array("d", [math.nan]) * capacity)
+
+    def __len__(self):
+
+        return self.size
+
+    def __repr__(self):
+
+        return f"BarRing({self.size}/{self.capacity} {self.interval} bars)"
+
+    def latest(self):
+
+        """
+        Return the date of the most recent bar, or `None`
+        if the buffer is empty.
+        """
+
+        if not self.size:
+            return None
+
+        return self.dates[(self.start + self.size - 1) % self.capacity]
+
+    def append(self, date, open, high, low, close, adj_close, volume):
+
+        """
+        Append a single bar, ignoring bars older than the
+        most recent one already held.
+        """
+
+        latest = self.latest()
+
+        if latest is not None and date < latest:
+            return
+        elif latest is not None and date == latest:
+            position = (self.start + self.size - 1) % self.capacity
+        elif self.size == self.capacity:
+            position = self.start
+            self.start = (self.start + 1) % self.capacity
+        else:
+            position = (self.start + self.size) % self.capacity
+            self.size += 1
+
+        values = (date, open, high, low, close, adj_close, volume)
+
+        self.dates[position] = date
+
+        for name, value in zip(BarHistory.columns[1:], values[1:]):
+            getattr(self, name)[position] = _to_missing(value)
+
+    def history(self):
+
+        """
+        Return the buffered bars as a `BarHistory`, most
+        recent bar first.
+        """
+
+        bars = BarHistory(self.interval, self.offset)
+        positions = [(self.start + index) % self.capacity for index in range(self.size)][::-1]
+
+        for name in BarHistory.columns:
+            column = getattr(self, name)
+            setattr(bars, name, array(column.typecode, [column[position] for position in positions]))
+
+        return bars
+
+
+def _to_float(value, digits=None):
+
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+    return round(value, digits) if digits is not None else value
+
+
+def _to_missing(value):
+
+    return math.nan if value is None or value == '' else float(value)
+
+
+def _from_missing(value, cast=float):
+
+    return None if math.isnan(value) else cast(value)
+
+
+def _label(date):
+
+    """
+    Format a bar date as a compact chart axis label.
+    """
+
+    date = str(date)
+
+    if " " in date:
+        day, clock = date.split(" ")
+        return f'{day.split("-")[1]}-{day.split("-")[-1]} {clock}'
+
+    return f'{date.split("-")[1]}-{date.split("-")[-1]}-{date.split("-")[0][2:]}'
+
+
+def _align(histories, missing="drop"):
+
+    """
+    Align the adjusted close prices of several `BarHistory`
+    values on shared trading dates.  Returns the dates as
+    ordinals, oldest first, and one price column per history.
+    """
+
+    if not histories:
+        return [], []
+
+    series = []
+
+    for bars in histories:
+        series.append({
+            ordinal: price
+            for ordinal, price in zip(bars.dates, bars.adj_close)
+            if ordinal and price == price
+        })
+
+    if not all(series):
+        return [], [[] for _ in series]
+
+    if missing == "drop":
+
+        shared = set(series[0])
+        for prices in series[1:]:
+            shared.intersection_update(prices)
+
+        dates = sorted(shared)
+
+        return dates, [[prices[date] for date in dates] for prices in series]
+
+    start = max(min(prices) for prices in series)
+    dates = sorted(date for date in set().union(*series) if date >= start)
+    columns = []
+
+    for prices in series:
+        column = []
+        last = prices[max(date for date in prices if date <= start)]
+        for date in dates:
+            last = prices.get(date, last)
+            column.append(last)
+        columns.append(column)
+
+    return dates, columns
+
+
+def _returns(prices):
+
+    return [(current / previous) - 1 if previous else 0.0 for previous, current in zip(prices, prices[1:])]
+
+
+def _covariance(columns, normalize=False):
+
+    """
+    Return the sample covariance matrix, or the correlation
+    matrix if `normalize` is set, of equal length columns.
+    Uses NumPy when it is installed.
+    """
+
+    if np is not None:
+
+        values = np.array(columns, dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = np.corrcoef(values) if normalize else np.cov(values)
+
+        return np.atleast_2d(matrix).round(6).tolist()
+
+    count = len(columns[0])
+    centered = []
+
+    for column in columns:
+        mean = math.fsum(column) / count
+        centered.append([value - mean for value in column])
+
+    constant = set()
+
+    if normalize:
+        scaled = []
+        for index, column in enumerate(centered):
+            norm = math.sqrt(sum(map(operator.mul, column, column)))
+            if not norm:
+                constant.add(index)
+            scaled.append([value / norm for value in column] if norm else column)
+        centered = scaled
+        divisor = 1
+    else:
+        divisor = count - 1
+
+    size = len(centered)
+    matrix = [[0.0] * size for _ in range(size)]
+
+    for i in range(size):
+        for j in range(i, size):
+            if i in constant or j in constant:
+                value = math.nan
+            else:
+                value = round(sum(map(operator.mul, centered[i], centered[j])) / divisor, 6)
+            matrix[i][j] = matrix[j][i] = value
+
+    return matrix
+
+
+def _recent(histories, days):
+
+    """
+    Return daily `BarHistory` values cut to the calendar
+    span of the most recent `days` trading dates, with a
+    margin for weekends and holidays.
+    """
+
+    latest = max((bars.dates[0] for bars in histories if len(bars)), default=0)
+    cutoff = latest - (days * 3) // 2 - 31
+    trimmed = []
+
+    for bars in histories:
+        dates = bars.dates
+        size = len(dates)
+        count = 0
+        while count < size and (dates[count] >= cutoff or not dates[count]):
+            count += 1
+        trimmed.append(bars[0:count])
+
+    return trimmed
+
+
+def _rolling_correlation(a, b, window):
+
+    """
+    Return the correlation of `a` and `b` over each window
+    of `window` consecutive values, computed from the
+    centered values of every window.  Windows in which
+    either series is constant have no correlation and are
+    reported as `None`.  Uses NumPy when it is installed.
+    """
+
+    if len(a) < window:
+        return []
+
+    if np is not None:
+
+        windows_a = np.lib.stride_tricks.sliding_window_view(np.asarray(a, dtype=float), window)
+        windows_b = np.lib.stride_tricks.sliding_window_view(np.asarray(b, dtype=float), window)
+        flat = (np.ptp(windows_a, axis=1) == 0) | (np.ptp(windows_b, axis=1) == 0)
+
+        centered_a = windows_a - windows_a.mean(axis=1, keepdims=True)
+        centered_b = windows_b - windows_b.mean(axis=1, keepdims=True)
+        covariance = (centered_a * centered_b).sum(axis=1)
+        variance = (centered_a * centered_a).sum(axis=1) * (centered_b * centered_b).sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.round(covariance / np.sqrt(variance), 6)
+
+        return [None if skip else value for skip, value in zip(flat.tolist(), values.tolist())]
+
+    values = []
+
+    for index in range(len(a) - window + 1):
+
+        window_a = a[index:index + window]
+        window_b = b[index:index + window]
+
+        if min(window_a) == max(window_a) or min(window_b) == max(window_b):
+            values.append(None)
+            continue
+
+        mean_a = math.fsum(window_a) / window
+        mean_b = math.fsum(window_b) / window
+        centered_a = [value - mean_a for value in window_a]
+        centered_b = [value - mean_b for value in window_b]
+        covariance = sum(map(operator.mul, centered_a, centered_b))
+        variance = sum(map(operator.mul, centered_a, centered_a)) * sum(map(operator.mul, centered_b, centered_b))
+
+        values.append(round(covariance / math.sqrt(variance), 6))
+
+    return values
+
+
+class PriceData():
+
+    """
+    A class providing instant access to live 
+    and historical stock market price data and
+    automated Plotly data visualization generators.
+    """
+
+    intervals = ("1m", "5m", "15m", "1h", "1d")
+
+    intraday_ranges = {"1m": "7d", "5m": "60d", "15m": "60d", "1h": "730d"}
+
+    def __init__(self, buffer_size=1000, source=None, cache=None):
+        """
+        Initialize the PriceData class and assign values to global
+        variables.
+
+        Intraday bars are held in ring buffers of `buffer_size`
+        bars per symbol and interval.  All data is retrieved from
+        the `DataSource` passed to the `source` parameter, the
+        network by default.
+
+        Passing a `QuoteCache` to the `cache` parameter will serve
+        repeated price requests from the cache according to
+        exchange trading hours.
+        """
+        if type(buffer_size) is not int or buffer_size < 1:
+            raise ValueError("buffer_size must be an integer value greater than or equal to 1")
+
+        start_target = datetime.strptime("1-21-1972", "%m-%d-%Y")
+        cur_date = datetime.strptime(datetime.now().strftime("%m-%d-%Y"), "%m-%d-%Y")
+        days = (cur_date - start_target).days
+        epoch_start = 76204800
+        epoch_target = (days * 86400) + 86400 + 1710979200
+        self.base_url = "https://query1.finance.yahoo.com/v7/finance/download/"
+        self.tail_url = f"?period1={str(epoch_start)}&period2={str(epoch_target)}&interval=1d&events=history&includeAdjustedClose=true"
+        self.chart_url = "https://query1.finance.yahoo.com/v8/finance/chart/"
+        self.buffer_size = buffer_size
+        self.buffers = {}
+        self.source = source or DataSource()
+        self.cache = cache
+        self.catalog = None
+
+    def current(self, symbol, interval="1d"):
+
+        """
+        Return the most recent stock price data available
+        for the stock symbol passed to the `symbol`
+        parameter.  Method will return live market
+        price quotes during trading hours.
+
+        Passing an intraday value to the `interval`
+        parameter (1m, 5m, 15m or 1h) will return the
+        most recent intraday bar instead of the daily bar.
+
+        PAYLOAD CONTENTS:
+
+        Object
+        """
+
+        self.symbol = symbol
+        info = self._catalog()
+        self.info = info.equity(symbol)
+
+        if interval not in self.intervals:
+            return f'===  INVALID OPTION - PLEASE USE ONE OF THE FOLLOWING {list(self.intervals)}  ==='
+        elif interval != "1d":
+
+            try:
+                self.bars = self._intraday(self.symbol, interval)
+                return {"info": self.info, "current": self.bars[0].to_dict()}
+            except:
+                return '===  ERROR: GET REQUEST FAILED  ==='
+
+        try:
+            self.rawData = self._download(self.symbol)
+        except:
+            return '===  ERROR: GET REQUEST FAILED  ==='
+
+        try:
+            self.bars = BarHistory.from_csv(self.rawData[-1:])
+            self.data = {"info": self.info, "current": self.bars[0].to_dict()}
+        except:
+            return '===  ERROR: DATA ERROR  ==='
+
+        return self.data
+
+    def history(self, symbol, days=None, date=None, date_start=None, date_end=None, compact=False, interval="1d"):
+
+        """
+        Return all historical stock price data available 
+        for the stock symbol passed to the `symbol` parameter.
+        
+        Passing a positive integer value to the `days` 
+        parameter will filter the historical data to include
+        records for the number of most recent days 
+        represented by the parameter value.
+
+        Passing a date to the `date` parameter
+        using the 'YYYY-DD-MM' format
+        will filter the historical data to include
+        a single record for the value 
+        assigned to the parameter.
+
+        Passing a date to both the `date_start` 
+        and the `date_end` parameter
+        using the 'YYYY-DD-MM' format
+        will filter the historical data to include
+        multiple records for the date range
+        represented by both values.  Values must 
+        be passed to both the date_start and 
+        date_end parameter for date ranges to be returned.
+
+        Passing `True` to the `compact` parameter
+        will return the price data as a `BarHistory`
+        backed by `array` buffers instead of an
+        array of objects, using a fraction of the
+        memory for long histories.  Missing values
+        are reported as `None` by its `Bar` rows.
+
+        Passing an intraday value to the `interval`
+        parameter (1m, 5m, 15m or 1h) will return
+        intraday bars from the ring buffer kept for the
+        symbol, refreshed with any new bars.  The `days`
+        parameter then counts bars rather than days.
+
+        PAYLOAD CONTENTS:
+
+        Object containing equity metadata,
+        current price data, and an array
+        of objects consisting of daily price
+        data for all available dates.
+
+        """
+
+        self.symbol = symbol
+
+        if interval not in self.intervals:
+            return f'===  INVALID OPTION - PLEASE USE ONE OF THE FOLLOWING {list(self.intervals)}  ==='
+        elif interval != "1d":
+
+            self.data = self.current(self.symbol, interval)
+
+            if type(self.data) is str:
+                return self.data
+
+        else:
+
+            try:
+                self.rawData = self._download(self.symbol)
+            except:
+                return '===  ERROR: GET REQUEST FAILED  ==='
+
+            try:
+                self.raw_data = self.rawData[1:][::-1]
+            except:
+                return '===  ERROR: DATA ERROR  ==='
+
+            try:
+                self.bars = BarHistory.from_csv(self.raw_data)
+                self.data = {"info": self._catalog().equity(self.symbol), "current": self.bars[0].to_dict()}
+            except:
+                return '===  ERROR: DATA ERROR  ==='
+
+        if days == None and date == None and date_start == None and date_end == None:
+
+            pass
+
+        elif date != None:
+
+            try:
+
+                self.bars = self.bars.between(date, date)
+
+            except:
+
+                return '===  DATE SELECTION NOT AVAILABLE  ==='
+
+        elif days != None:
+
+            if type(days) is int and days >= 1:
+
+                self.bars = self.bars[0:days]
+
+            else:
+
+                return '===  ERROR: DATA TYPE - DAYS MUST BE INT  ==='
+
+        elif date_start != None and date_end != None:
+
+            try:
+
+                self.bars = self.bars.between(date_start, date_end)
+
+            except:
+
+                return '===  DATE SELECTION NOT AVAILABLE  ==='
+
+        if compact == True:
+
+            self.data["history"] = self.bars
+
+        else:
+
+            self.data["history"] = self.bars.to_dicts()
+
+        return self.data
+
+    def _catalog(self):
+
+        """
+        Return the `FinInfo` metadata catalog, retrieving it
+        on first use only.
+        """
+
+        if self.catalog is None:
+            self.catalog = FinInfo(self.source)
+
+        return self.catalog
+
+    def _download(self, symbol):
+
+        """
+        Return the raw CSV lines, header included, of the
+        daily price history for `symbol`.
+        """
+
+        url = self.base_url + symbol + self.tail_url
+
+        if self.cache is None:
+            return self.source.lines(url)
+
+        return self.cache.get((symbol, "1d"), lambda: self.source.lines(url))
+
+    def _bars(self, symbol):
+
+        """
+        Return the full price history for `symbol` as a
+        `BarHistory`, most recent date first.
+        """
+
+        return BarHistory.from_csv(self._download(symbol)[1:][::-1])
+
+    def _intraday(self, symbol, interval):
+
+        """
+        Refresh the ring buffer for `symbol` and `interval`
+        with any new intraday bars and return its contents
+        as a `BarHistory`, most recent bar first.
+        """
+
+        ring = self.buffers.get((symbol, interval))
+        params = {"interval": interval}
+
+        if ring is None or not len(ring):
+            params["range"] = self.intraday_ranges[interval]
+        else:
+            params["period1"] = ring.latest()
+            params["period2"] = int(time.time())
+
+        url = f"{self.chart_url}{symbol}?{urlencode(params)}"
+
+        if self.cache is None:
+            content = self.source.fetch(url)
+        else:
+            content = self.cache.get((symbol, interval, "range" in params), lambda: self.source.fetch(url))
+
+        result = json.loads(content)["chart"]["result"][0]
 
-            self.row_data = {}
+        if ring is None:
+            ring = BarRing(self.buffer_size, interval, result["meta"].get("gmtoffset", 0))
+            self.buffers[(symbol, interval)] = ring
 
-            try:
-                self.price = row.decode().split(",")
-            except:
-                return '===  ERROR: DATA ERROR  ==='
+        quote = result["indicators"]["quote"][0]
 
-            try:
-                self.row_data['Date'] = str(self.price[0])
-            except:
-                self.row_data['Date'] = ''
+        for index, timestamp in enumerate(result.get("timestamp") or []):
 
-            try:
-                self.row_data['Open'] = round(float(self.price[1]), 2)
-            except:
-                self.row_data['Open'] = ''
+            close = _to_float(quote["close"][index], 2)
 
-            try:
-                self.row_data['High'] = round(float(self.price[2]), 2)
-            except:
-                self.row_data['High'] = ''
+            ring.append(
+                timestamp,
+                _to_float(quote["open"][index], 2),
+                _to_float(quote["high"][index], 2),
+                _to_float(quote["low"][index], 2),
+                close,
+                close,
+                _to_float(quote["volume"][index])
+            )
 
-            try:
-                self.row_data['Low'] = round(float(self.price[3]), 2)
-            except:
-                self.row_data['Low'] = ''
+        return ring.history()
 
-            try:
-                self.row_data['Close'] = round(float(self.price[4]), 2)
-            except:
-                self.row_data['Close'] = ''
+    def _histories(self, symbols, workers=8):
 
-            try:
-                self.row_data['Adj Close'] = round(float(self.price[5]), 2)
-            except:
-                self.row_data['Adj Close'] = ''
+        """
+        Download the price history of every symbol in
+        `symbols` concurrently.  Returns an object mapping
+        symbols to `BarHistory` values and an array of
+        symbols that could not be retrieved.
+        """
 
+        def fetch(symbol):
             try:
-                self.row_data['Volume'] = int(self.price[6])
+                return symbol, self._bars(symbol)
             except:
-                self.row_data['Volume'] = ''
+                return symbol, None
 
-            try:
-                self.row_data['Change Amount'] = round((self.row_data['Close'] - self.row_data['Open']), 2)
-            except:
-                self.row_data['Change Amount'] = ''
+        histories = {}
+        errors = []
 
-            try:
-                if self.row_data['Change Amount'] != 0:
-                    self.row_data['Change Rate'] = round((self.row_data['Change Amount'] / self.row_data['Open']), 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for symbol, bars in executor.map(fetch, symbols):
+                if bars is None or len(bars) == 0:
+                    errors.append(symbol)
                 else:
-                    self.row_data['Change Rate'] = 0
-            except:
-                self.row_data['Change Rate'] = ''
+                    histories[symbol] = bars
 
-            try:
+        return histories, errors
 
-                self.row_data['Day Range'] = round((self.row_data['Low'] - self.row_data['High']), 2)
+    def _symbol_list(self, symbols):
 
-                if self.row_data['Day Range'] < 0:
-                    self.row_data['Day Range'] = self.row_data['Day Range'] * -1
-                else:
-                    pass
+        """
+        Resolve `symbols` to an array of stock symbols.  A
+        string is looked up as a sector, then as an industry,
+        of the metadata catalog.
+        """
 
-            except:
+        if isinstance(symbols, str):
+            info = self._catalog()
+            for lookup in (info.sector_symbols, info.industry_symbols):
+                resolved = lookup(symbols)
+                if isinstance(resolved, list):
+                    return resolved
+            return None
 
-                self.row_data['Day Range'] = ''
+        return list(symbols)
 
-            self.data["history"].append(self.row_data)
+    def _matrix(self, kind, symbols, days, missing, heatmap, histories, workers):
 
-        if days == None and date == None and date_start == None and date_end == None:
+        symbols = self._symbol_list(symbols)
 
-            return self.data
+        if not symbols:
+            return '===  ERROR: INVALID SYMBOLS, SECTOR OR INDUSTRY ENTRY  ==='
+        elif missing not in ("drop", "ffill"):
+            return "===  INVALID OPTION - MISSING MUST BE 'drop' OR 'ffill'  ==="
+        elif days != None and (type(days) is not int or days < 2):
+            return '===  DATA TYPE ERROR - DAYS MUST BE INTEGER VALUE GREATER THAN OR EQUAL TO 2  ==='
 
-        elif date != None:
+        histories = dict(histories or {})
+        fetched, errors = self._histories([symbol for symbol in symbols if symbol not in histories], workers)
+        histories.update(fetched)
+        symbols = [symbol for symbol in symbols if symbol in histories]
 
-            try:
+        if not symbols:
+            return '===  ERROR: GET REQUEST FAILED  ==='
 
-                self.data["history"] = [row for row in self.data["history"] if row["Date"] == date]
+        selected = [histories[symbol] for symbol in symbols]
 
-                return self.data
+        if days != None:
+            selected = _recent(selected, days + 1)
 
-            except:
+        dates, prices = _align(selected, missing)
 
-                return '===  DATE SELECTION NOT AVAILABLE  ==='
+        if days != None:
+            dates = dates[-(days + 1):]
+            prices = [column[-(days + 1):] for column in prices]
 
-        elif days != None:
+        if len(dates) < 3:
+            return '===  ERROR: INSUFFICIENT OVERLAPPING PRICE DATA  ==='
 
-            if type(days) is int and days >= 1:
+        returns = [_returns(column) for column in prices]
+        matrix = _covariance(returns, kind == "correlation")
 
-                self.data["history"] = self.data["history"][0:days]
+        self.data = {
+            "symbols": symbols,
+            "errors": errors,
+            "date_start": datetime.fromordinal(dates[1]).strftime("%Y-%m-%d"),
+            "date_end": datetime.fromordinal(dates[-1]).strftime("%Y-%m-%d"),
+            "observations": len(dates) - 1,
+            kind: {symbol: dict(zip(symbols, row)) for symbol, row in zip(symbols, matrix)}
+        }
 
-                return self.data
+        if heatmap == True:
 
-            else:
+            fig = go.Figure(data=go.Heatmap(
+                z=matrix,
+                x=symbols,
+                y=symbols,
+                colorscale="RdBu",
+                zmid=0
+            ))
 
-                return '===  ERROR: DATA TYPE - DAYS MUST BE INT  ==='
+            fig.update_layout(title=f'{kind.title()} of Daily Returns {self.data["date_start"]} - {self.data["date_end"]}')
+            fig.update_yaxes(autorange="reversed")
+            fig.show()
 
-        elif date_start != None and date_end != None:
+        return self.data
 
-            self.data["history"] = [row for row in self.data["history"] if row["Date"] >= date_start and row["Date"] <= date_end]
+    def correlation(self, symbols, days=None, missing="drop", heatmap=False, histories=None, workers=8):
 
-            return self.data
+        """
+        Return the correlation matrix of daily returns,
+        computed from adjusted close prices, for the stock
+        symbols passed to the `symbols` parameter.
+
+        The `symbols` parameter accepts an array of stock
+        symbols or the name of a sector or industry in the
+        metadata catalog.  Price histories are downloaded
+        concurrently using `workers` threads; histories
+        already loaded can be supplied through the
+        `histories` parameter as an object mapping symbols
+        to `BarHistory` values.
+
+        Histories are aligned on trading dates according
+        to the `missing` parameter:
+
+            - drop: only dates on which every symbol
+              has a price are used (default).
+            - ffill: every date from the latest first
+              trading date among the symbols is used, with
+              gaps filled by the previous available price.
+
+        Passing a positive integer value to the `days`
+        parameter will restrict the calculation to the
+        most recent aligned dates.
+
+        Passing `True` to the `heatmap` parameter will
+        open a Plotly heatmap of the matrix in the default
+        web browser.
 
-        else:
+        PAYLOAD CONTENTS:
 
-            return self.data
+        Object containing the symbols used, the symbols
+        that could not be retrieved, the date range and
+        number of observations, and the matrix as an
+        object of objects keyed by symbol.
+        """
+
+        return self._matrix("correlation", symbols, days, missing, heatmap, histories, workers)
+
+    def covariance(self, symbols, days=None, missing="drop", heatmap=False, histories=None, workers=8):
+
+        """
+        Return the covariance matrix of daily returns,
+        computed from adjusted close prices, for the stock
+        symbols passed to the `symbols` parameter.
+
+        Accepts the same parameters as the `correlation`
+        method.
+
+        PAYLOAD CONTENTS:
+
+        Object containing the symbols used, the symbols
+        that could not be retrieved, the date range and
+        number of observations, and the matrix as an
+        object of objects keyed by symbol.
+        """
+
+        return self._matrix("covariance", symbols, days, missing, heatmap, histories, workers)
+
+    def rolling_correlation(self, symbol_a, symbol_b, window=30, days=None, missing="drop", histories=None):
+
+        """
+        Return the correlation of daily returns between
+        `symbol_a` and `symbol_b` over a rolling window
+        of `window` trading dates.
+
+        Accepts the `days`, `missing` and `histories`
+        parameters of the `correlation` method.
+
+        PAYLOAD CONTENTS:
 
-    def candlestick(self, symbol, days):
+        An array of objects containing the `Date` and
+        `Correlation` values, most recent date first.
+        """
+
+        if type(window) is not int or window < 2:
+            return '===  DATA TYPE ERROR - WINDOW MUST BE INTEGER VALUE GREATER THAN OR EQUAL TO 2  ==='
+        elif days != None and (type(days) is not int or days < 1):
+            return '===  ERROR: DATA TYPE - DAYS MUST BE INT  ==='
+        elif missing not in ("drop", "ffill"):
+            return "===  INVALID OPTION - MISSING MUST BE 'drop' OR 'ffill'  ==="
+
+        histories = dict(histories or {})
+        fetched, errors = self._histories([symbol for symbol in (symbol_a, symbol_b) if symbol not in histories], 2)
+        histories.update(fetched)
+
+        if errors:
+            return '===  ERROR: GET REQUEST FAILED  ==='
+
+        selected = [histories[symbol_a], histories[symbol_b]]
+
+        if days != None:
+            selected = _recent(selected, days + window)
+
+        dates, prices = _align(selected, missing)
+        returns_a, returns_b = [_returns(column) for column in prices]
+        dates = dates[1:]
+
+        self.data = [
+            {"Date": datetime.fromordinal(date).strftime("%Y-%m-%d"), "Correlation": value}
+            for date, value in zip(dates[window - 1:], _rolling_correlation(returns_a, returns_b, window))
+        ][::-1]
+
+        if days != None:
+            self.data = self.data[0:days]
+
+        return self.data
+
+    def candlestick(self, symbol, days, interval="1d"):
 
         """
         Will generate a Plotly Candlestick
@@ -614,6 +1823,11 @@ class PriceData():
         number of days represented by the
         value passed to the `days` parameter.
 
+        Passing an intraday value to the `interval`
+        parameter (1m, 5m, 15m or 1h) will plot the
+        most recent `days` bars held in the intraday
+        ring buffer, refreshed on every call.
+
         Executing this method will automatically
         open the data visualization in the 
         default web browser.
@@ -631,16 +1845,20 @@ class PriceData():
 
         self.symbol = symbol
         self.days = days
-        self.data = self.history(symbol, self.days)
+        self.data = self.history(symbol, self.days, interval=interval, compact=True)
+
+        if type(self.data) is str:
+            return self.data
+
         self.info = self.data["info"]
-        self.current = self.data["current"]
-        self.history = self.data["history"]
+        self.bars = self.data["history"]
+        rows = self.bars.to_dicts()
 
-        open_price = [row["Open"] for row in self.history]
-        close_price = [row["Close"] for row in self.history]
-        low_price = [row["Low"] for row in self.history]
-        high_price = [row["High"] for row in self.history]
-        dates = [f'{str(row["Date"]).split("-")[1]}-{str(row["Date"]).split("-")[-1]}-{str(row["Date"]).split("-")[0][2:]}' for row in self.history]
+        open_price = list(self.bars.open)
+        close_price = list(self.bars.close)
+        low_price = list(self.bars.low)
+        high_price = list(self.bars.high)
+        dates = [_label(row["Date"]) for row in rows]
 
         fig = go.Figure(
             data=[go.Candlestick(
@@ -659,11 +1877,11 @@ class PriceData():
 
         try:
             fig.show()
-            return self.history
+            return rows
         except:
             return f'===  SYMBOL DATA TYPE ERROR OR INVALID SYMBOL  ==='
 
-    def line(self, symbol, days, param):
+    def line(self, symbol, days, param, interval="1d"):
 
         """
         Will generate a Plotly Line
@@ -673,6 +1891,11 @@ class PriceData():
         for the specified data column passed
         to the `param` parameter.
 
+        Passing an intraday value to the `interval`
+        parameter (1m, 5m, 15m or 1h) will plot the
+        most recent `days` bars held in the intraday
+        ring buffer, refreshed on every call.
+
         Executing this method will automatically
         open the data visualization in the 
         default web browser.
@@ -707,7 +1930,7 @@ class PriceData():
             "Open"
         ]
 
-        if type(days) is not int or days >= 0:
+        if type(days) is not int or days < 1:
             return f'===  DATA TYPE ERROR - DAYS MUST BE INTEGER VALUE GREATER THAN OR EQUAL TO 1  ==='
         elif param not in param_options:
             return f'===  INVALID OPTION - PLEASE USE ONE OF THE FOLLOWING {param_options}  ==='
@@ -716,14 +1939,17 @@ class PriceData():
 
         self.symbol = symbol
         self.days = days
-        self.data = self.history(symbol, self.days)
+        self.data = self.history(symbol, self.days, interval=interval)
+
+        if type(self.data) is str:
+            return self.data
+
         self.info = self.data["info"]
-        self.current = self.data["current"]
-        self.history = self.data["history"]
+        rows = self.data["history"]
         self.param = param.title()
 
-        quote_data = [row[self.param] for row in self.history]
-        dates = [f'{str(row["Date"]).split("-")[1]}-{str(row["Date"]).split("-")[-1]}-{str(row["Date"]).split("-")[0][2:]}' for row in self.history]
+        quote_data = [row[self.param] for row in rows]
+        dates = [_label(row["Date"]) for row in rows]
 
         fig = go.Figure([go.Scatter(x=dates, y=quote_data)])
 
@@ -732,7 +1958,7 @@ class PriceData():
 
         try:
             fig.show()
-            return self.history
+            return rows
         except:
             return f'===  SYMBOL DATA TYPE ERROR OR INVALID SYMBOL  ==='
 
@@ -812,3 +2038,580 @@ class PriceData():
             return self.history
         except:
             return f'===  SYMBOL DATA TYPE ERROR OR INVALID SYMBOL  ==='
+
+
+class Screener():
+
+    """
+    A catalog screener answering filter and sort queries over
+    a materialized table of per-symbol summary statistics
+    joined with the metadata catalog, without network access.
+
+    The table is built and refreshed incrementally with the
+    `update` method and can be stored with `save` and
+    restored with `load`.
+
+    TABLE COLUMNS:
+
+        - Symbol
+        - Name
+        - Sector
+        - Industry
+        - Date
+        - Close
+        - Volume
+        - Average Volume
+        - 52 Week High
+        - 52 Week Low
+        - From 52 Week High
+        - Change Rate
+        - Day Range
+        - Day Range Percentile
+
+    Statistics cover the 52 weeks up to the most recent
+    date with a closing price of each symbol.  `From 52 Week High` is the latest
+    close relative to the 52 week high, e.g. -0.05 for 5%
+    below it, and `Day Range Percentile` is the share of
+    days in the period with a day range at or below the
+    latest one.
+    """
+
+    text_columns = ("Symbol", "Name", "Sector", "Industry", "Date")
+
+    numeric_columns = (
+        "Close",
+        "Volume",
+        "Average Volume",
+        "52 Week High",
+        "52 Week Low",
+        "From 52 Week High",
+        "Change Rate",
+        "Day Range",
+        "Day Range Percentile"
+    )
+
+    operators = {
+        "<": operator.lt,
+        "<=": operator.le,
+        "==": operator.eq,
+        "!=": operator.ne,
+        ">": operator.gt,
+        ">=": operator.ge
+    }
+
+    def __init__(self, price_data=None):
+
+        """
+        Initialize an empty screener.  Data is retrieved
+        through the `PriceData` instance passed to the
+        `price_data` parameter.
+        """
+
+        self.price_data = price_data or PriceData()
+        self.rows = {}
+        self.table = {column: [] for column in self.text_columns}
+        self.table.update({column: array("d") for column in self.numeric_columns})
+
+    def __len__(self):
+
+        return len(self.rows)
+
+    def update(self, symbols=None, histories=None, workers=8):
+
+        """
+        Add or refresh the summary statistics for the stock
+        symbols passed to the `symbols` parameter, or by
+        default every symbol already in the table together
+        with every symbol supplied through `histories`.
+
+        The `symbols` parameter also accepts the name of a
+        sector or industry in the metadata catalog.  Price
+        histories are downloaded concurrently unless supplied
+        through the `histories` parameter as an object mapping
+        symbols to `BarHistory` values.
+
+        PAYLOAD CONTENTS:
+
+        An array of symbols that could not be retrieved.
+        """
+
+        histories = dict(histories or {})
+
+        if symbols is None:
+            symbols = list(dict.fromkeys([*self.rows, *histories]))
+        else:
+            symbols = self.price_data._symbol_list(symbols)
+
+        if symbols is None:
+            return '===  ERROR: INVALID SYMBOLS, SECTOR OR INDUSTRY ENTRY  ==='
+        fetched, errors = self.price_data._histories([symbol for symbol in symbols if symbol not in histories], workers)
+        histories.update(fetched)
+
+        equities = self.price_data._catalog().data["equities"]
+
+        for symbol in symbols:
+            if symbol in histories:
+                equity = equities.get(symbol, {})
+                self._set(symbol, {
+                    "Symbol": symbol,
+                    "Name": equity.get("name", ''),
+                    "Sector": equity.get("sector", ''),
+                    "Industry": equity.get("industry", ''),
+                    **_summary(histories[symbol])
+                })
+
+        return errors
+
+    def _set(self, symbol, values):
+
+        row = self.rows.get(symbol)
+
+        if row is None:
+            self.rows[symbol] = len(self.rows)
+            for column in self.table:
+                self.table[column].append(values[column])
+        else:
+            for column in self.table:
+                self.table[column][row] = values[column]
+
+    def _column(self, name):
+
+        column = self.table[name]
+
+        if np is not None:
+            if name in self.numeric_columns:
+                return np.frombuffer(column, dtype=float) if len(column) else np.zeros(0)
+            return np.array(column, dtype=object)
+
+        return column
+
+    def screen(self, filters=(), sort=None, descending=False, limit=None):
+
+        """
+        Return the table rows matching every filter passed to
+        the `filters` parameter, optionally sorted by the
+        column passed to the `sort` parameter and limited to
+        `limit` rows.
+
+        Each filter is a `(column, operator, value)` tuple
+        using one of the operators <, <=, ==, !=, >, >= or
+        `in`, which takes an array of values.  Values must be
+        numbers for numeric columns and strings for the others.
+        A value naming a table column compares the two columns
+        row by row.  Rows with missing values never
+        match a numeric filter and sort last.
+
+        EXAMPLE:
+
+            screener.screen([
+                ("Sector", "==", "Technology"),
+                ("From 52 Week High", ">=", -0.05),
+                ("Volume", ">", "Average Volume")
+            ], sort="Change Rate", descending=True)
+
+        PAYLOAD CONTENTS:
+
+        An array of objects.
+        """
+
+        count = len(self.rows)
+        mask = np.ones(count, dtype=bool) if np is not None else [True] * count
+
+        for column, name, value in filters:
+
+            if column not in self.table:
+                return f'===  INVALID COLUMN - PLEASE USE ONE OF THE FOLLOWING {list(self.table)}  ==='
+            elif name != "in" and name not in self.operators:
+                return f'===  INVALID OPERATOR - PLEASE USE ONE OF THE FOLLOWING {list(self.operators) + ["in"]}  ==='
+
+            numeric = column in self.numeric_columns
+            expected = "NUMBER" if numeric else "STRING"
+            is_column = name != "in" and isinstance(value, str) and value in self.table
+
+            if name == "in" and not isinstance(value, (list, tuple, set, frozenset)):
+                return "===  INVALID VALUE - 'in' REQUIRES AN ARRAY OF VALUES  ==="
+            elif is_column and (value in self.numeric_columns) != numeric:
+                return f'===  INVALID VALUE - {column} MUST BE COMPARED WITH A {expected} COLUMN  ==='
+            elif not is_column and not all(_matches_type(item, numeric) for item in (value if name == "in" else [value])):
+                return f'===  INVALID VALUE - {column} MUST BE COMPARED WITH A {expected}  ==='
+
+            left = self._column(column)
+            right = self._column(value) if is_column else value
+
+            if np is not None:
+                matches = np.isin(left, list(value)) if name == "in" else self.operators[name](left, right)
+                mask &= matches.astype(bool)
+                if numeric:
+                    mask &= ~np.isnan(left)
+                if numeric and is_column:
+                    mask &= ~np.isnan(right)
+            elif name == "in":
+                mask = [keep and item in value for keep, item in zip(mask, left)]
+            elif not is_column:
+                mask = [keep and self.operators[name](item, value) for keep, item in zip(mask, left)]
+            else:
+                mask = [keep and self.operators[name](a, b) for keep, a, b in zip(mask, left, right)]
+
+            if np is None and numeric:
+                missing = [math.isnan(item) for item in left]
+                if is_column:
+                    missing = [a or math.isnan(b) for a, b in zip(missing, right)]
+                mask = [keep and not gap for keep, gap in zip(mask, missing)]
+
+        selected = [index for index, keep in enumerate(mask) if keep]
+
+        if sort is not None:
+
+            if sort not in self.table:
+                return f'===  INVALID COLUMN - PLEASE USE ONE OF THE FOLLOWING {list(self.table)}  ==='
+
+            column = self.table[sort]
+            present = [index for index in selected if not (sort in self.numeric_columns and math.isnan(column[index]))]
+            missing = sorted(set(selected).difference(present))
+            selected = sorted(present, key=column.__getitem__, reverse=descending) + missing
+
+        if limit is not None:
+            selected = selected[0:limit]
+
+        return [self.row(index) for index in selected]
+
+    def row(self, index):
+
+        """
+        Return the table row at position `index`, or for the
+        stock symbol passed as `index`, as an object.
+        """
+
+        if isinstance(index, str):
+            index = self.rows[index]
+
+        values = {column: self.table[column][index] for column in self.table}
+
+        for column in self.numeric_columns:
+            if math.isnan(values[column]):
+                values[column] = ''
+            elif column == "Volume":
+                values[column] = int(values[column])
+
+        return values
+
+    def save(self, path):
+
+        """
+        Save the summary table to a JSON file at `path`.
+        """
+
+        Path(path).write_text(json.dumps({column: list(values) for column, values in self.table.items()}))
+
+    def load(self, path):
+
+        """
+        Replace the summary table with one saved to the JSON
+        file at `path` by the `save` method.
+        """
+
+        data = json.loads(Path(path).read_text())
+
+        self.table = {column: list(data[column]) for column in self.text_columns}
+        self.table.update({column: array("d", data[column]) for column in self.numeric_columns})
+        self.rows = {symbol: index for index, symbol in enumerate(self.table["Symbol"])}
+
+        return self
+
+
+def _matches_type(value, numeric):
+
+    if numeric:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    return isinstance(value, str)
+
+
+def _summary(bars):
+
+    """
+    Return the `Screener` summary statistics of a daily
+    `BarHistory` ordered most recent date first.
+    """
+
+    values = {column: math.nan for column in Screener.numeric_columns}
+    values["Date"] = ''
+
+    if not len(bars):
+        return values
+
+    valid = [index for index in range(len(bars)) if not math.isnan(bars.close[index])]
+
+    if not valid:
+        return values
+
+    latest = bars[valid[0]]
+    cutoff = bars._day(valid[0]) - 365
+    window = [index for index in range(valid[0], len(bars)) if bars._day(index) > cutoff]
+
+    highs = [bars.high[index] for index in window if not math.isnan(bars.high[index])]
+    lows = [bars.low[index] for index in window if not math.isnan(bars.low[index])]
+    volumes = [bars.volume[index] for index in window if not math.isnan(bars.volume[index])]
+    ranges = [abs(bars.high[index] - bars.low[index]) for index in window]
+    ranges = [value for value in ranges if not math.isnan(value)]
+
+    values["Date"] = latest.date or ''
+    values["Close"] = _to_missing(latest.close)
+    values["Volume"] = _to_missing(latest.volume)
+    values["Change Rate"] = _to_missing(latest.change_rate)
+    values["Day Range"] = _to_missing(latest.day_range)
+
+    if highs:
+        values["52 Week High"] = max(highs)
+        values["From 52 Week High"] = round(values["Close"] / values["52 Week High"] - 1, 4) if values["52 Week High"] else math.nan
+
+    if lows:
+        values["52 Week Low"] = min(lows)
+
+    if volumes:
+        values["Average Volume"] = round(math.fsum(volumes) / len(volumes))
+
+    if ranges and not math.isnan(values["Day Range"]):
+        values["Day Range Percentile"] = round(sum(value <= values["Day Range"] + 1e-9 for value in ranges) / len(ranges), 4)
+
+    return values
+
+
+class _RateLimiter():
+
+    """
+    Space calls evenly so that no more than `rate` calls
+    per second are started across all threads.
+    """
+
+    def __init__(self, rate):
+
+        self.interval = 1 / rate if rate else 0
+        self.next_call = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+def download(symbols, output, format="csv", workers=8, rate=None, retries=2, resume=True, source=None, log=print):
+
+    """
+    Download the daily price history of every symbol in
+    `symbols` to the `output` directory, one file per
+    symbol, using `workers` threads and at most `rate`
+    requests per second.
+
+    `format` OPTIONS:
+
+        - csv: the raw CSV file, oldest date first.
+        - json: an array of objects as returned by the
+          `history` method, most recent date first.
+
+    Completed symbols are recorded in a `.progress.<format>`
+    file in the output directory; when `resume` is `True`
+    they are skipped, so an interrupted or partly failed
+    run continues where it stopped.  The file is removed
+    once a run finishes without errors, so the next run
+    downloads everything again.  On `KeyboardInterrupt`
+    queued downloads are cancelled and those in flight are
+    recorded before the exception propagates.
+
+    Data is retrieved from the `DataSource` passed to
+    the `source` parameter, the network by default.
+
+    PAYLOAD CONTENTS:
+
+    Object containing the number of symbols downloaded
+    and skipped, bytes written, elapsed seconds and an
+    object mapping failed symbols to error messages.
+    """
+
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    checkpoint = output / f".progress.{format}"
+
+    done = set()
+
+    if resume and checkpoint.exists():
+        done = set(checkpoint.read_text().split())
+    elif checkpoint.exists():
+        checkpoint.unlink()
+
+    symbols = list(dict.fromkeys(symbols))
+    pending = [symbol for symbol in symbols if symbol not in done]
+    price_data = PriceData(source=source)
+    limiter = _RateLimiter(rate)
+
+    summary = {"downloaded": 0, "skipped": len(symbols) - len(pending), "bytes": 0, "seconds": 0, "errors": {}}
+
+    def fetch(symbol):
+
+        for attempt in range(retries + 1):
+            limiter.wait()
+            try:
+                lines = price_data._download(symbol)
+                break
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+        if format == "json":
+            content = json.dumps(BarHistory.from_csv(lines[1:][::-1]).to_dicts()).encode()
+        else:
+            content = b"".join(lines)
+
+        target = output / f"{symbol}.{format}"
+        temporary = output / f".{symbol}.{format}.tmp"
+        temporary.write_bytes(content)
+        os.replace(temporary, target)
+
+        return len(content)
+
+    start = time.monotonic()
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    progress = open(checkpoint, "a")
+    recorded = set()
+    futures = {}
+
+    def record(future):
+
+        symbol = futures[future]
+        recorded.add(future)
+
+        try:
+            size = future.result()
+        except Exception as error:
+            summary["errors"][symbol] = str(error) or type(error).__name__
+        else:
+            summary["downloaded"] += 1
+            summary["bytes"] += size
+            progress.write(symbol + "\n")
+            progress.flush()
+
+    try:
+
+        futures = {executor.submit(fetch, symbol): symbol for symbol in pending}
+
+        for count, future in enumerate(as_completed(futures), 1):
+
+            record(future)
+
+            if count % 100 == 0 or count == len(futures):
+                elapsed = time.monotonic() - start
+                log(f"{count}/{len(futures)} symbols  {count / elapsed:.1f} symbols/s  {len(summary['errors'])} errors")
+
+    except BaseException:
+
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in futures:
+            if future not in recorded and not future.cancelled():
+                try:
+                    future.exception()
+                except CancelledError:
+                    continue
+                record(future)
+
+        raise
+
+    finally:
+
+        executor.shutdown()
+        progress.close()
+
+    if not summary["errors"]:
+        checkpoint.unlink()
+
+    summary["seconds"] = round(time.monotonic() - start, 2)
+
+    return summary
+
+
+def main(argv=None):
+
+    """
+    Command line entry point for bulk downloads:
+
+        python -m quickfin [SYMBOL ...] [--sector NAME | --industry NAME | --all]
+    """
+
+    parser = argparse.ArgumentParser(prog="quickfin", description="Download daily price history for many symbols.")
+    parser.add_argument("symbols", nargs="*", help="stock symbols to download")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--sector", help="download every symbol in a catalog sector")
+    selection.add_argument("--industry", help="download every symbol in a catalog industry")
+    selection.add_argument("--all", action="store_true", help="download every symbol in the catalog")
+    parser.add_argument("-o", "--output", default="quickfin_data", help="output directory (default: quickfin_data)")
+    parser.add_argument("-f", "--format", choices=("csv", "json"), default="csv", help="output file format (default: csv)")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="parallel downloads (default: 8)")
+    parser.add_argument("-r", "--rate", type=float, default=None, help="maximum requests per second (default: unlimited)")
+    parser.add_argument("--retries", type=int, default=2, help="retries per symbol (default: 2)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and download everything again")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", metavar="ARCHIVE", help="also save raw responses to an archive directory")
+    archive.add_argument("--replay", metavar="ARCHIVE", help="read raw responses from an archive directory instead of the network")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        source = RecordingSource(args.record)
+    elif args.replay:
+        source = ReplaySource(args.replay)
+    else:
+        source = DataSource()
+
+    symbols = [symbol.upper() for symbol in args.symbols]
+
+    if args.sector or args.industry or args.all:
+        info = FinInfo(source)
+        if args.all:
+            selected = info.symbols()
+        elif args.sector:
+            selected = info.sector_symbols(args.sector)
+        else:
+            selected = info.industry_symbols(args.industry)
+        if type(selected) is str:
+            parser.error(selected)
+        symbols += selected
+
+    if not symbols:
+        parser.error("no symbols selected")
+
+    try:
+        summary = download(
+            symbols,
+            args.output,
+            format=args.format,
+            workers=args.workers,
+            rate=args.rate,
+            retries=args.retries,
+            resume=not args.restart,
+            source=source
+        )
+    except KeyboardInterrupt:
+        print("interrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+
+    print(f"downloaded {summary['downloaded']}, skipped {summary['skipped']}, failed {len(summary['errors'])} "
+          f"in {summary['seconds']}s ({summary['bytes'] / 1e6:.1f} MB)")
+
+    for symbol, error in sorted(summary["errors"].items()):
+        print(f"  {symbol}: {error}", file=sys.stderr)
+
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())